@@ -0,0 +1,8 @@
+-- Let the database allocate rolebutton IDs, previously these were assigned manually, leaving the sequence behind
+
+CREATE SEQUENCE IF NOT EXISTS button_roles_entry_id_seq OWNED BY button_roles.entry_id;
+
+ALTER TABLE button_roles
+ALTER COLUMN entry_id SET DEFAULT nextval('button_roles_entry_id_seq');
+
+SELECT setval('button_roles_entry_id_seq', COALESCE((SELECT MAX(entry_id) FROM button_roles), 0) + 1, false);
\ No newline at end of file
@@ -0,0 +1,3 @@
+-- Rolebuttons are looked up by entry_id alone, which the (guild_id, entry_id) primary key cannot serve
+
+CREATE INDEX IF NOT EXISTS button_roles_entry_id_idx ON button_roles (entry_id);
\ No newline at end of file
@@ -28,7 +28,7 @@ DO
 $do$
 DECLARE _schema_version integer;
 BEGIN
-    SELECT 6 INTO _schema_version; -- The current schema version, change this when creating new migrations
+    SELECT 8 INTO _schema_version; -- The current schema version, change this when creating new migrations
 
 	IF NOT EXISTS (SELECT schema_version FROM schema_info) THEN
 		INSERT INTO schema_info (schema_version) 
@@ -129,6 +129,8 @@ CREATE TABLE IF NOT EXISTS button_roles
         ON DELETE CASCADE
 );
 
+CREATE INDEX IF NOT EXISTS button_roles_entry_id_idx ON button_roles (entry_id);
+
 CREATE TABLE IF NOT EXISTS tags
 (
     guild_id bigint NOT NULL,
@@ -77,7 +77,7 @@ async def get_policies(guild: hikari.SnowflakeishOr[hikari.Guild]) -> t.Dict[str
 
     invalid = []
     for key in policies.keys():
-        if key not in default_automod_policies.keys():
+        if key not in default_automod_policies:
             invalid.append(key)
 
     for key in invalid:
@@ -398,7 +398,7 @@ async def blacklist_cmd(ctx: SnedPrefixContext, mode: str, user: hikari.User) ->
             return
 
         await ctx.app.db.execute("""INSERT INTO blacklist (user_id) VALUES ($1)""", user.id)
-        await ctx.app.db_cache.refresh(table="blacklist", user_id=user.id)
+        await ctx.app.db_cache.invalidate(table="blacklist", user_id=user.id)
         await ctx.event.message.add_reaction("✅")
         await ctx.respond("✅ User added to blacklist")
     elif mode.casefold() in ["del", "delete", "remove"]:
@@ -408,7 +408,7 @@ async def blacklist_cmd(ctx: SnedPrefixContext, mode: str, user: hikari.User) ->
             return
 
         await ctx.app.db.execute("""DELETE FROM blacklist WHERE user_id = $1""", user.id)
-        await ctx.app.db_cache.refresh(table="blacklist", user_id=user.id)
+        await ctx.app.db_cache.invalidate(table="blacklist", user_id=user.id)
         await ctx.event.message.add_reaction("✅")
         await ctx.respond("✅ User removed from blacklist")
 
@@ -440,6 +440,7 @@ async def resetsettings_cmd(ctx: SnedPrefixContext, guild_id: int) -> None:
 
     await ctx.app.db.wipe_guild(guild)
     await ctx.app.db_cache.wipe(guild)
+    ctx.app.mod.invalidate_settings(guild)
 
     await ctx.event.message.add_reaction("✅")
     await ctx.respond(f"✅ Wiped data for guild `{guild.id}`.")
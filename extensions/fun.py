@@ -697,33 +697,32 @@ async def dice(
     )
 
 
-@fun.listener(miru.ComponentInteractionCreateEvent)
 async def on_dice_reroll(event: miru.ComponentInteractionCreateEvent) -> None:
-    if event.custom_id.startswith("DICE:"):
-        amount, sides, show_sum, author_id = event.custom_id.split(":", maxsplit=1)[1].split(":")
-        amount, sides, show_sum, author_id = int(amount), int(sides), bool(int(show_sum)), hikari.Snowflake(author_id)
-
-        if event.author.id != author_id:
-            await event.context.respond(
-                embed=hikari.Embed(
-                    title="❌ Cannot reroll",
-                    description=f"Only the user who rolled the dice can reroll it.",
-                    color=const.ERROR_COLOR,
-                ),
-                flags=hikari.MessageFlag.EPHEMERAL,
-            )
-            return
-
-        await event.context.edit_response(
-            embed=roll_dice(amount, sides, show_sum),
-            components=miru.View().add_item(
-                miru.Button(
-                    emoji="🎲",
-                    label="Reroll",
-                    custom_id=f"DICE:{amount}:{sides}:{int(show_sum)}:{event.context.author.id}",
-                )
+    """Handle dice rerolls, routed here by the bot for custom_ids starting with 'DICE:'"""
+    amount, sides, show_sum, author_id = event.custom_id.split(":", maxsplit=1)[1].split(":")
+    amount, sides, show_sum, author_id = int(amount), int(sides), bool(int(show_sum)), hikari.Snowflake(author_id)
+
+    if event.author.id != author_id:
+        await event.context.respond(
+            embed=hikari.Embed(
+                title="❌ Cannot reroll",
+                description=f"Only the user who rolled the dice can reroll it.",
+                color=const.ERROR_COLOR,
             ),
+            flags=hikari.MessageFlag.EPHEMERAL,
         )
+        return
+
+    await event.context.edit_response(
+        embed=roll_dice(amount, sides, show_sum),
+        components=miru.View().add_item(
+            miru.Button(
+                emoji="🎲",
+                label="Reroll",
+                custom_id=f"DICE:{amount}:{sides}:{int(show_sum)}:{event.context.author.id}",
+            )
+        ),
+    )
 
 
 @fun.command
@@ -857,9 +856,11 @@ async def wiki(ctx: SnedSlashContext, query: str) -> None:
 
 def load(bot: SnedBot) -> None:
     bot.add_plugin(fun)
+    bot.add_component_handler("DICE", on_dice_reroll)
 
 
 def unload(bot: SnedBot) -> None:
+    bot.remove_component_handler("DICE")
     bot.remove_plugin(fun)
 
 
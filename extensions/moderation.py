@@ -1,4 +1,7 @@
+import asyncio
 import datetime
+import functools
+import io
 import logging
 import re
 import typing as t
@@ -6,6 +9,7 @@ import typing as t
 import hikari
 import lightbulb
 import miru
+from hikari.internal import routes
 
 import models
 from etc import constants as const
@@ -25,8 +29,118 @@ from utils import helpers
 
 logger = logging.getLogger(__name__)
 
+try:
+    import re2  # type: ignore
+except ImportError:
+    re2 = None
+
 mod = SnedPlugin("Moderation", include_datastore=True)
 
+MASSBAN_CONCURRENCY = 8  # Maximum amount of massban requests in flight at once, across all guilds
+MASSBAN_BULK_SIZE = 200  # Maximum amount of users the bulk-ban endpoint accepts per request
+MASSBAN_ATTACHMENT_LIMIT = 2000  # Above this many matches, the confirm prompt does not attach the list of members
+
+# Not yet exposed by hikari, so the request is made through the REST client directly
+POST_GUILD_BULK_BAN = routes.Route(routes.POST, "/guilds/{guild}/bulk-ban")
+
+# Static responses of the massban confirm prompt, these are never modified after creation
+MASSBAN_CONFIRM_EMBED = hikari.Embed(
+    title="Starting Massban...",
+    description="This could take some time...",
+    color=const.WARN_COLOR,
+)
+MASSBAN_CANCEL_EMBED = hikari.Embed(
+    title="Massban interrupted",
+    description="Massban session was terminated prematurely. No users were banned.",
+    color=const.ERROR_COLOR,
+)
+
+# Shared by all massban sessions, so concurrent sessions cannot exceed the request budget together
+_massban_semaphore = asyncio.Semaphore(MASSBAN_CONCURRENCY)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a user-supplied regex, caching the result for repeated invocations."""
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_linear_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a user-supplied regex with re2 if available, guaranteeing linear-time matching.
+    Falls back to the standard library engine if re2 is not installed or does not support the pattern."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+async def _bulk_ban(
+    app: SnedBot, guild: hikari.SnowflakeishOr[hikari.PartialGuild], users: t.Sequence[hikari.PartialUser], reason: str
+) -> t.Tuple[t.Set[hikari.Snowflake], t.Sequence[hikari.PartialUser]]:
+    """Ban users in chunks through the bulk-ban endpoint.
+
+    Parameters
+    ----------
+    app : SnedBot
+        The application to make the requests with.
+    guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+        The guild to ban the users from.
+    users : t.Sequence[hikari.PartialUser]
+        The users to ban.
+    reason : str
+        The audit log reason for the bans.
+
+    Returns
+    -------
+    t.Tuple[t.Set[hikari.Snowflake], t.Sequence[hikari.PartialUser]]
+        The IDs of the users that were successfully banned, and the users that were not banned because
+        the endpoint turned out to be unavailable, forbidden or failed. These should be banned one by one.
+    """
+    route = POST_GUILD_BULK_BAN.compile(guild=hikari.Snowflake(guild))
+    banned: t.Set[hikari.Snowflake] = set()
+    remaining: t.List[hikari.PartialUser] = []
+
+    for i in range(0, len(users), MASSBAN_BULK_SIZE):
+        chunk = users[i : i + MASSBAN_BULK_SIZE]
+        try:
+            async with _massban_semaphore:
+                response = await app.rest._request(
+                    route,
+                    json={"user_ids": [str(user.id) for user in chunk]},
+                    reason=reason,
+                )
+        except hikari.BadRequestError:  # Returned if none of the users in the chunk could be banned
+            continue
+        except (hikari.NotFoundError, hikari.ForbiddenError):
+            # Bulk-banning is unavailable, leave the rest of the users to the caller
+            remaining.extend(users[i:])
+            break
+        except hikari.HTTPError:
+            # Server errors, ratelimits that are too long, etc., leave this chunk to the caller
+            remaining.extend(chunk)
+            continue
+
+        assert isinstance(response, dict)
+        banned.update(hikari.Snowflake(user_id) for user_id in response.get("banned_users", ()))
+
+    return banned, remaining
+
+
+def _massban_report(header: str, members: t.Iterable[hikari.Member]) -> bytes:
+    """Render a plaintext report of the given members for a massban session."""
+    buffer = io.BytesIO()
+    buffer.write(header.encode())
+
+    for member in members:
+        buffer.write(
+            f"{member} ({member.id})  |  Joined: {member.joined_at}  |  Created: {member.created_at}\n".encode()
+        )
+
+    return buffer.getvalue()
+
 
 @mod.command
 @lightbulb.app_command_permissions(hikari.Permissions.MANAGE_GUILD, dm_enabled=False)
@@ -64,7 +178,7 @@ async def role_add(ctx: SnedSlashContext, user: hikari.Member, role: hikari.Role
     helpers.is_member(user)
     assert ctx.guild_id and ctx.member
 
-    me = ctx.app.cache.get_member(ctx.guild_id, ctx.app.user_id)
+    me = ctx.me
     assert me
 
     if role.is_managed or role.is_premium_subscriber_role or role.id == ctx.guild_id:
@@ -119,7 +233,7 @@ async def role_del(ctx: SnedSlashContext, user: hikari.Member, role: hikari.Role
     helpers.is_member(user)
     assert ctx.guild_id and ctx.member
 
-    me = ctx.app.cache.get_member(ctx.guild_id, ctx.app.user_id)
+    me = ctx.me
     assert me
 
     if role.is_managed or role.is_premium_subscriber_role or role.id == ctx.guild_id:
@@ -189,14 +303,15 @@ async def purge(ctx: SnedSlashContext) -> None:
     channel = ctx.get_channel() or await ctx.app.rest.fetch_channel(ctx.channel_id)
     assert isinstance(channel, hikari.TextableGuildChannel)
 
-    predicates = [
-        # Ignore deferred typing indicator so it doesn't get deleted lmfao
-        lambda message: not (hikari.MessageFlag.LOADING & message.flags)
-    ]
+    # Patterns that must all match the message content, merged into a single regex of lookaheads so that
+    # every message is scanned once. The user's regex comes first so that any backreferences it contains
+    # keep their group numbers, invites & links may appear anywhere in the message.
+    patterns: t.List[str] = []
+    user_regex: t.Optional[re.Pattern[str]] = None
 
     if ctx.options.regex:
         try:
-            regex = re.compile(ctx.options.regex)
+            user_regex = _compile_regex(ctx.options.regex)
         except re.error as error:
             await ctx.respond(
                 embed=hikari.Embed(
@@ -209,50 +324,92 @@ async def purge(ctx: SnedSlashContext) -> None:
 
             assert ctx.invoked is not None and ctx.invoked.cooldown_manager is not None
             return await ctx.invoked.cooldown_manager.reset_cooldown(ctx)
-        else:
-            predicates.append(lambda message, regex=regex: regex.match(message.content) if message.content else False)
-
-    if ctx.options.startswith:
-        predicates.append(
-            lambda message: message.content.startswith(ctx.options.startswith) if message.content else False
-        )
 
-    if ctx.options.endswith:
-        predicates.append(lambda message: message.content.endswith(ctx.options.endswith) if message.content else False)
-
-    if ctx.options.notext:
-        predicates.append(lambda message: not message.content)
-
-    if ctx.options.onlytext:
-        predicates.append(lambda message: message.content and not message.attachments and not message.embeds)
-
-    if ctx.options.attachments:
-        predicates.append(lambda message: bool(message.attachments))
+        patterns.append(ctx.options.regex)
 
     if ctx.options.invites:
-        predicates.append(
-            lambda message: helpers.is_invite(message.content, fullmatch=False) if message.content else False
-        )
+        patterns.append(rf"[\s\S]*?(?:{helpers.INVITE_REGEX.pattern})")
 
     if ctx.options.links:
-        predicates.append(
-            lambda message: helpers.is_url(message.content, fullmatch=False) if message.content else False
-        )
+        patterns.append(rf"[\s\S]*?(?:{helpers.LINK_REGEX.pattern})")
+
+    content_regex: t.Optional[re.Pattern[str]] = None
+    invite_search: t.Optional[t.Callable[[str], t.Optional[re.Match[str]]]] = None
+    url_search: t.Optional[t.Callable[[str], t.Optional[re.Match[str]]]] = None
+
+    if user_regex is not None and user_regex.flags & ~re.UNICODE:
+        # Global inline flags such as (?i) would apply to the entire combined pattern (or fail to compile,
+        # depending on the Python version), so check the user's regex on its own and fall back to the
+        # precompiled search methods for invites & links
+        content_regex = user_regex
+        invite_search = helpers.invite_search if ctx.options.invites else None
+        url_search = helpers.url_search if ctx.options.links else None
+
+    elif patterns:
+        content_regex = _compile_regex("".join(f"(?=(?:{pattern}))" for pattern in patterns))
+
+    # Resolve options once so the predicate does not go through ctx.options for every message
+    startswith = ctx.options.startswith
+    endswith = ctx.options.endswith
+    notext = bool(ctx.options.notext)
+    onlytext = bool(ctx.options.onlytext)
+    attachments = bool(ctx.options.attachments)
+    embeds = bool(ctx.options.embeds)
+    user_id = ctx.options.user.id if ctx.options.user else None
+
+    loading = int(hikari.MessageFlag.LOADING)
+
+    def predicate(message: hikari.Message) -> bool:
+        # Ignore deferred typing indicator so it doesn't get deleted lmfao
+        flags = message.flags
+        if flags and int(flags) & loading:
+            return False
+
+        content = message.content
+
+        if user_id is not None and message.author.id != user_id:
+            return False
+        if notext and content:
+            return False
+        if attachments and not message.attachments:
+            return False
+        if embeds and not message.embeds:
+            return False
+        if onlytext and (not content or message.attachments or message.embeds):
+            return False
+
+        if content_regex or invite_search or url_search or startswith or endswith:
+            if not content:
+                return False
+            if startswith and not content.startswith(startswith):
+                return False
+            if endswith and not content.endswith(endswith):
+                return False
+            if invite_search and not invite_search(content):
+                return False
+            if url_search and not url_search(content):
+                return False
+            if content_regex and not content_regex.match(content):
+                return False
+
+        return True
 
-    if ctx.options.embeds:
-        predicates.append(lambda message: bool(message.embeds))
+    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
 
-    if ctx.options.user:
-        predicates.append(lambda message: message.author.id == ctx.options.user.id)
+    # Messages older than 14 days cannot be bulk-deleted
+    cutoff = helpers.utcnow() - datetime.timedelta(days=14)
 
-    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
+    count: int = ctx.options.count
+    messages: t.List[hikari.Message] = []
 
-    messages = (
-        await ctx.app.rest.fetch_messages(channel)
-        .take_until(lambda m: (helpers.utcnow() - datetime.timedelta(days=14)) > m.created_at)
-        .filter(*predicates)
-        .limit(ctx.options.count)
-    )
+    async for message in ctx.app.rest.fetch_messages(channel):
+        if cutoff > message.created_at:
+            break
+
+        if predicate(message):
+            messages.append(message)
+            if len(messages) >= count:
+                break
 
     if messages:
         try:
@@ -515,9 +672,7 @@ async def timeout_cmd(
         )
         return
 
-    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
-
-    embed = await ctx.app.mod.timeout(user, ctx.member, communication_disabled_until, reason)
+    embed = await ctx.mod_defer_if_slow(ctx.app.mod.timeout(user, ctx.member, communication_disabled_until, reason))
 
     await ctx.mod_respond(
         embed=embed,
@@ -564,8 +719,7 @@ async def timeouts_remove_cmd(ctx: SnedSlashContext, user: hikari.Member, reason
         )
         return
 
-    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
-    await ctx.app.mod.remove_timeout(user, ctx.member, reason)
+    await ctx.mod_defer_if_slow(ctx.app.mod.remove_timeout(user, ctx.member, reason))
 
     await ctx.mod_respond(
         embed=hikari.Embed(
@@ -632,14 +786,14 @@ async def ban_cmd(
     else:
         banned_until = None
 
-    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
-
-    embed = await ctx.app.mod.ban(
-        user,
-        ctx.member,
-        duration=banned_until,
-        days_to_delete=int(days_to_delete) if days_to_delete else 0,
-        reason=reason,
+    embed = await ctx.mod_defer_if_slow(
+        ctx.app.mod.ban(
+            user,
+            ctx.member,
+            duration=banned_until,
+            days_to_delete=int(days_to_delete) if days_to_delete else 0,
+            reason=reason,
+        )
     )
     await ctx.mod_respond(
         embed=embed,
@@ -689,13 +843,14 @@ async def softban_cmd(
     helpers.is_member(user)
     assert ctx.member is not None
 
-    await ctx.respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
-    embed = await ctx.app.mod.ban(
-        user,
-        ctx.member,
-        soft=True,
-        days_to_delete=int(days_to_delete) if days_to_delete else 0,
-        reason=reason,
+    embed = await ctx.mod_defer_if_slow(
+        ctx.app.mod.ban(
+            user,
+            ctx.member,
+            soft=True,
+            days_to_delete=int(days_to_delete) if days_to_delete else 0,
+            reason=reason,
+        )
     )
     await ctx.mod_respond(embed=embed)
 
@@ -715,8 +870,7 @@ async def unban_cmd(ctx: SnedSlashContext, user: hikari.User, reason: t.Optional
 
     assert ctx.member is not None
 
-    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
-    embed = await ctx.app.mod.unban(user, ctx.member, reason=reason)
+    embed = await ctx.mod_defer_if_slow(ctx.app.mod.unban(user, ctx.member, reason=reason))
     await ctx.mod_respond(
         embed=embed,
         components=miru.View().add_item(
@@ -743,8 +897,7 @@ async def kick_cmd(ctx: SnedSlashContext, user: hikari.Member, reason: t.Optiona
     helpers.is_member(user)
     assert ctx.member is not None
 
-    await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
-    embed = await ctx.app.mod.kick(user, ctx.member, reason=reason)
+    embed = await ctx.mod_defer_if_slow(ctx.app.mod.kick(user, ctx.member, reason=reason))
     await ctx.mod_respond(
         embed=embed,
         components=miru.View().add_item(
@@ -815,27 +968,17 @@ async def massban(ctx: SnedSlashContext) -> None:
     if ctx.options["joined-after"]:
         helpers.is_member(ctx.options["joined-after"])
 
-    predicates = [
-        lambda member: not member.is_bot,
-        lambda member: member.id != ctx.author.id,
-        lambda member: member.discriminator != "0000",  # Deleted users
-    ]
-
     guild = ctx.get_guild()
     assert guild is not None
 
     me = guild.get_member(ctx.app.user_id)
     assert me is not None
 
-    def is_above_member(member: hikari.Member, me: hikari.Member = me) -> bool:
-        # Check if the bot's role is above the member's or not to reduce invalid requests.
-        return helpers.is_above(me, member)
-
-    predicates.append(is_above_member)
+    regex: t.Optional[re.Pattern[str]] = None
 
     if ctx.options.regex:
         try:
-            regex = re.compile(ctx.options.regex)
+            regex = _compile_linear_regex(ctx.options.regex)
         except re.error as error:
             await ctx.respond(
                 embed=hikari.Embed(
@@ -848,55 +991,76 @@ async def massban(ctx: SnedSlashContext) -> None:
             assert ctx.invoked is not None and ctx.invoked.cooldown_manager is not None
             await ctx.invoked.cooldown_manager.reset_cooldown(ctx)
             return
-        else:
-            predicates.append(lambda member, regex=regex: regex.match(member.username))
 
     await ctx.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
 
-    # Ensure the specified guild is explicitly chunked
-    await ctx.app.request_guild_members(guild, include_presences=False)
-
-    members = list(guild.get_members().values())
-
-    if ctx.options["no-avatar"]:
-        predicates.append(lambda member: member.avatar_url is None)
-    if ctx.options["no-roles"]:
-        predicates.append(lambda member: len(member.role_ids) <= 1)
+    # Ensure the specified guild is explicitly chunked, unless every member is already cached
+    if not guild.member_count or len(guild.get_members()) < guild.member_count:
+        await ctx.app.request_guild_members(guild, include_presences=False)
 
     now = helpers.utcnow()
 
-    if ctx.options.created:
-
-        def created(member: hikari.User, offset=now - datetime.timedelta(minutes=ctx.options.created)) -> bool:
-            return member.created_at > offset
-
-        predicates.append(created)
+    # Resolve options once so the predicate does not go through ctx.options for every member
+    author_id = ctx.author.id
+    no_avatar = bool(ctx.options["no-avatar"])
+    no_roles = bool(ctx.options["no-roles"])
+    # Creation time is encoded in the snowflake, so compare millisecond timestamps instead of building datetimes
+    created_after: t.Optional[int] = (
+        hikari.Snowflake.from_datetime(now - datetime.timedelta(minutes=ctx.options.created)) >> 22
+        if ctx.options.created
+        else None
+    )
 
+    # Fold all join time constraints into a single window
+    joined_after_bounds: t.List[datetime.datetime] = []
     if ctx.options.joined:
-
-        def joined(member: hikari.User, offset=now - datetime.timedelta(minutes=ctx.options.joined)) -> bool:
-            if not isinstance(member, hikari.Member):
-                return True
-            else:
-                return member.joined_at and member.joined_at > offset
-
-        predicates.append(joined)
-
+        joined_after_bounds.append(now - datetime.timedelta(minutes=ctx.options.joined))
     if ctx.options["joined-after"]:
+        joined_after_bounds.append(ctx.options["joined-after"].joined_at)
 
-        def joined_after(member: hikari.Member, joined_after=ctx.options["joined-after"]) -> bool:
-            return member.joined_at and joined_after.joined_at and member.joined_at > joined_after.joined_at
-
-        predicates.append(joined_after)
-
-    if ctx.options["joined-before"]:
+    joined_after = max(joined_after_bounds) if joined_after_bounds else None
+    joined_before: t.Optional[datetime.datetime] = (
+        ctx.options["joined-before"].joined_at if ctx.options["joined-before"] else None
+    )
 
-        def joined_before(member: hikari.Member, joined_before=ctx.options["joined-before"]) -> bool:
-            return member.joined_at and joined_before.joined_at and member.joined_at < joined_before.joined_at
+    # Resolve the roles the bot cannot act on once, so the hierarchy check is a single set operation per member
+    role_positions = {role_id: role.position for role_id, role in guild.get_roles().items()}
+    me_top_position = max((role_positions.get(role_id, 0) for role_id in me.role_ids), default=0)
+    protected_role_ids = frozenset(
+        role_id for role_id, position in role_positions.items() if position >= me_top_position
+    )
 
-        predicates.append(joined_before)
+    def predicate(member_id: int, member: hikari.Member) -> bool:
+        # ID based checks first, these only need the cache key and no attribute access at all
+        if member_id == author_id:
+            return False
+        if created_after is not None and (member_id >> 22) <= created_after:
+            return False
+        # Read user fields off the underlying user once, instead of going through the member's delegating properties
+        user = member.user
+        if user.is_bot:
+            return False
+        if user.discriminator == "0000":  # Deleted users
+            return False
+        if no_avatar and user.avatar_hash is not None:
+            return False
+        role_ids = member.role_ids
+        if no_roles and len(role_ids) > 1:
+            return False
+        if joined_after and not member.joined_at > joined_after:
+            return False
+        if joined_before and not member.joined_at < joined_before:
+            return False
+        # Most expensive checks last, so they only run for members that passed everything else
+        if regex and not regex.match(user.username):
+            return False
+        # Check if the bot's role is above the member's or not to reduce invalid requests.
+        if not protected_role_ids.isdisjoint(role_ids):
+            return False
+        return True
 
-    to_ban = [member for member in members if all(predicate(member) for predicate in predicates)]
+    # Filter straight from the cache view, without copying every member into an intermediate list
+    to_ban = [member for member_id, member in guild.get_members().items() if predicate(member_id, member)]
 
     if len(to_ban) == 0:
         await ctx.respond(
@@ -909,44 +1073,36 @@ async def massban(ctx: SnedSlashContext) -> None:
         )
         return
 
-    content = [f"Sned Massban Session: {guild.name}   |  Matched members against criteria: {len(to_ban)}\n{now}\n"]
-
-    for member in to_ban:
-        content.append(f"{member} ({member.id})  |  Joined: {member.joined_at}  |  Created: {member.created_at}")
-
-    content = "\n".join(content)
-    file = hikari.Bytes(content.encode("utf-8"), "members_to_ban.txt")
+    header = f"Sned Massban Session: {guild.name}   |  Matched members against criteria: {len(to_ban)}\n{now}\n\n"
 
     if ctx.options.show == True:
-        await ctx.mod_respond(attachment=file)
+        await ctx.mod_respond(attachment=hikari.Bytes(_massban_report(header, to_ban), "members_to_ban.txt"))
         return
 
+    # Avoid rendering and uploading huge lists just for the confirm prompt
+    if len(to_ban) <= MASSBAN_ATTACHMENT_LIMIT:
+        file: hikari.UndefinedOr[hikari.Bytes] = hikari.Bytes(_massban_report(header, to_ban), "members_to_ban.txt")
+        review = "Please review the attached list above for a full list of matched users."
+    else:
+        file = hikari.UNDEFINED
+        review = "The list of matched users is too large to attach, use `show` to view it."
+
     reason = ctx.options.reason if ctx.options.reason is not None else "No reason provided."
     helpers.format_reason(reason, ctx.member, max_length=512)
 
     embed = hikari.Embed(
         title="⚠️ Confirm Massban",
-        description=f"You are about to ban **{len(to_ban)}** users. Are you sure you want to do this? Please review the attached list above for a full list of matched users. The user journals will not be updated.",
+        description=f"You are about to ban **{len(to_ban)}** users. Are you sure you want to do this? {review} The user journals will not be updated.",
         color=const.WARN_COLOR,
     )
-    confirm_embed = hikari.Embed(
-        title="Starting Massban...",
-        description="This could take some time...",
-        color=const.WARN_COLOR,
-    )
-    cancel_embed = hikari.Embed(
-        title="Massban interrupted",
-        description="Massban session was terminated prematurely. No users were banned.",
-        color=const.ERROR_COLOR,
-    )
 
     is_ephemeral = bool((await ctx.app.mod.get_settings(guild.id)).flags & ModerationFlags.IS_EPHEMERAL)
     flags = hikari.MessageFlag.EPHEMERAL if is_ephemeral else hikari.MessageFlag.NONE
     confirmed = await ctx.confirm(
         embed=embed,
         flags=flags,
-        cancel_payload={"embed": cancel_embed, "flags": flags, "components": []},
-        confirm_payload={"embed": confirm_embed, "flags": flags, "components": []},
+        cancel_payload={"embed": MASSBAN_CANCEL_EMBED, "flags": flags, "components": []},
+        confirm_payload={"embed": MASSBAN_CONFIRM_EMBED, "flags": flags, "components": []},
         attachment=file,
     )
 
@@ -957,31 +1113,44 @@ async def massban(ctx: SnedSlashContext) -> None:
     if userlog:
         await userlog.d.actions.freeze_logging(guild.id)
 
-    count = 0
-
-    for member in to_ban:
-        try:
-            await guild.ban(member, reason=reason)
-        except (hikari.HTTPError, hikari.ForbiddenError):
-            pass
-        else:
-            count += 1
-
-    file = hikari.Bytes(content.encode("utf-8"), "members_banned.txt")
+    try:
+        banned_ids, remaining = await _bulk_ban(ctx.app, guild, to_ban, reason)
+
+        if remaining:
+            # Bulk-banning is unavailable or failed for some chunks, fall back to banning those users one by one
+            async def ban_member(member: hikari.PartialUser) -> bool:
+                async with _massban_semaphore:
+                    try:
+                        await guild.ban(member, reason=reason)
+                    except (hikari.HTTPError, hikari.ForbiddenError):
+                        return False
+                    return True
+
+            # Ratelimits are handled by hikari, the semaphore only bounds the amount of requests queued at once
+            results = await asyncio.gather(*(ban_member(member) for member in remaining))
+            banned_ids.update(member.id for member, success in zip(remaining, results) if success)
+
+        count = len(banned_ids)
+        banned_header = f"Sned Massban Session: {guild.name}   |  Banned members: {count}/{len(to_ban)}\n{now}\n\n"
+        file = hikari.Bytes(
+            _massban_report(banned_header, (member for member in to_ban if member.id in banned_ids)),
+            "members_banned.txt",
+        )
 
-    assert ctx.guild_id is not None and ctx.member is not None
-    await ctx.app.dispatch(MassBanEvent(ctx.app, ctx.guild_id, ctx.member, len(to_ban), count, file, reason))
+        assert ctx.guild_id is not None and ctx.member is not None
+        await ctx.app.dispatch(MassBanEvent(ctx.app, ctx.guild_id, ctx.member, len(to_ban), count, file, reason))
 
-    await ctx.mod_respond(
-        embed=hikari.Embed(
-            title="✅ Massban finished",
-            description=f"Banned **{count}/{len(to_ban)}** users.",
-            color=const.EMBED_GREEN,
+        await ctx.mod_respond(
+            embed=hikari.Embed(
+                title="✅ Massban finished",
+                description=f"Banned **{count}/{len(to_ban)}** users.",
+                color=const.EMBED_GREEN,
+            )
         )
-    )
 
-    if userlog:
-        await userlog.d.actions.unfreeze_logging(ctx.guild_id)
+    finally:
+        if userlog:
+            await userlog.d.actions.unfreeze_logging(guild.id)
 
 
 def load(bot: SnedBot) -> None:
@@ -93,11 +93,8 @@ class SnoozeView(miru.View):
         return await super().on_timeout()
 
 
-@reminders.listener(miru.ComponentInteractionCreateEvent, bind=True)
-async def reminder_component_handler(plugin: SnedPlugin, event: miru.ComponentInteractionCreateEvent) -> None:
-
-    if not event.context.custom_id.startswith(("RMSS:", "RMAR:")):
-        return
+async def reminder_component_handler(event: miru.ComponentInteractionCreateEvent) -> None:
+    """Handle reminder snoozes & additional recipient sign-ups, routed here by the bot for 'RMSS:' and 'RMAR:'."""
 
     assert event.context.guild_id is not None
 
@@ -137,7 +134,7 @@ async def reminder_component_handler(plugin: SnedPlugin, event: miru.ComponentIn
     else:  # Reminder additional recipients
         timer_id = int(event.context.custom_id.split(":")[1])
         try:
-            timer: Timer = await plugin.app.scheduler.get_timer(timer_id, event.context.guild_id)
+            timer: Timer = await reminders.app.scheduler.get_timer(timer_id, event.context.guild_id)
             if timer.channel_id != event.context.channel_id or timer.event != TimerEvent.REMINDER:
                 raise ValueError
 
@@ -187,7 +184,7 @@ async def reminder_component_handler(plugin: SnedPlugin, event: miru.ComponentIn
 
             notes["additional_recipients"].append(event.context.user.id)
             timer.notes = json.dumps(notes)
-            await plugin.app.scheduler.update_timer(timer)
+            await reminders.app.scheduler.update_timer(timer)
             await event.context.respond(
                 embed=hikari.Embed(
                     title="✅ Signed up to reminder",
@@ -200,7 +197,7 @@ async def reminder_component_handler(plugin: SnedPlugin, event: miru.ComponentIn
         else:
             notes["additional_recipients"].remove(event.context.user.id)
             timer.notes = json.dumps(notes)
-            await plugin.app.scheduler.update_timer(timer)
+            await reminders.app.scheduler.update_timer(timer)
             await event.context.respond(
                 embed=hikari.Embed(
                     title="✅ Removed from reminder",
@@ -447,9 +444,13 @@ async def on_reminder(plugin: SnedPlugin, event: events.TimerCompleteEvent):
 
 def load(bot: SnedBot) -> None:
     bot.add_plugin(reminders)
+    bot.add_component_handler("RMSS", reminder_component_handler)
+    bot.add_component_handler("RMAR", reminder_component_handler)
 
 
 def unload(bot: SnedBot) -> None:
+    bot.remove_component_handler("RMSS")
+    bot.remove_component_handler("RMAR")
     bot.remove_plugin(reminders)
 
 
@@ -117,7 +117,7 @@ async def report(ctx: SnedContext, member: hikari.Member, message: t.Optional[hi
         await ctx.app.db_cache.refresh(table="reports", guild_id=ctx.guild_id)
         return await report_error(ctx)
 
-    me = ctx.app.cache.get_member(ctx.guild_id, ctx.app.user_id)
+    me = ctx.me
     assert me is not None
 
     perms = lightbulb.utils.permissions_in(channel, me)
@@ -1,3 +1,5 @@
+import asyncio
+import copy
 import enum
 import logging
 import typing as t
@@ -12,8 +14,11 @@ from models import SnedBot
 from models import SnedSlashContext
 from models.checks import has_permissions
 from models.plugin import SnedPlugin
+from models.rolebutton import CUSTOM_ID_PREFIX
 from models.rolebutton import RoleButton
 from models.rolebutton import RoleButtonMode
+from models.rolebutton import parse_emoji
+from models.rolebutton import unpack_custom_id
 from utils import helpers
 from utils.ratelimiter import BucketType
 from utils.ratelimiter import RateLimiter
@@ -36,6 +41,107 @@ BUTTON_MODES = {
 
 role_button_ratelimiter = RateLimiter(2, 1, BucketType.MEMBER, wait=False)
 
+# Static error responses of the rolebutton listener, these are never modified after creation
+ORPHANED_EMBED = hikari.Embed(
+    title="❌ Orphaned",
+    description="The role this button was pointing to was deleted! Contact an administrator!",
+    color=0xFF0000,
+)
+MISSING_PERMISSIONS_EMBED = hikari.Embed(
+    title="❌ Missing Permissions",
+    description="Bot does not have `Manage Roles` permissions! Contact an administrator!",
+    color=0xFF0000,
+)
+RATELIMITED_EMBED = hikari.Embed(
+    title="❌ Slow Down!",
+    description="You are clicking too fast!",
+    color=0xFF0000,
+)
+MISSING_DATA_EMBED = hikari.Embed(
+    title="❌ Missing Data",
+    description="The rolebutton you clicked on is missing data, or was improperly deleted! Contact an administrator!",
+    color=0xFF0000,
+)
+INSUFFICIENT_PERMISSIONS_EMBED = hikari.Embed(
+    title="❌ Insufficient permissions",
+    description="Failed changing role due to an issue with permissions and/or role hierarchy! Please contact an administrator!",
+    color=0xFF0000,
+)
+
+# Default success responses, copied and completed with the role's mention per click
+ROLE_ADDED_EMBED = hikari.Embed(title="✅ Role added", color=0x77B255)
+ROLE_ADDED_TOGGLE_EMBED = hikari.Embed(title="✅ Role added", color=0x77B255).set_footer(
+    "To remove the role, click the button again!"
+)
+ROLE_REMOVED_EMBED = hikari.Embed(title="✅ Role removed", color=0x77B255)
+
+# Startup task deleting orphaned rolebuttons
+role_buttons.d._cleanup_task = None
+
+# Mapping of entry_id: task for orphaned rolebuttons currently being removed
+_orphan_cleanups: t.Dict[int, asyncio.Task[None]] = {}
+
+
+async def _cleanup_orphan_button(guild_id: hikari.Snowflake, entry_id: int, role_id: int) -> None:
+    """Remove a rolebutton whose role was deleted, so future clicks on it do not have to be handled."""
+    try:
+        button = await RoleButton.fetch(entry_id)
+        if not button or button.guild_id != guild_id or button.role_id != role_id:
+            return
+
+        # Make sure the role is actually gone and not just missing from the cache
+        roles = await role_buttons.app.rest.fetch_roles(guild_id)
+        if any(role.id == role_id for role in roles):
+            return
+
+        await button.delete()
+    except hikari.HTTPError as e:
+        logger.info(f"Failed to clean up orphaned rolebutton #{entry_id} in guild {guild_id}: {e}")
+    except Exception:
+        logger.exception(f"Unexpected error while cleaning up orphaned rolebutton #{entry_id} in guild {guild_id}")
+
+
+def _schedule_orphan_cleanup(guild_id: hikari.Snowflake, entry_id: int, role_id: int) -> None:
+    """Start removing an orphaned rolebutton in the background, unless it is already being removed."""
+    if entry_id in _orphan_cleanups:
+        return
+
+    task = asyncio.create_task(_cleanup_orphan_button(guild_id, entry_id, role_id))
+    _orphan_cleanups[entry_id] = task
+    task.add_done_callback(lambda _: _orphan_cleanups.pop(entry_id, None))
+
+
+async def _cleanup_orphans(bot: SnedBot) -> None:
+    """Delete all rolebuttons whose role no longer exists after startup, removing them from their messages."""
+    await bot.wait_until_started()
+
+    records = await bot.db.fetch("""SELECT guild_id, role_id FROM button_roles""")
+
+    # Guilds that have rolebuttons pointing to roles missing from the cache,
+    # guilds that are not cached at all cannot be resolved and are skipped
+    guild_ids = {
+        hikari.Snowflake(record["guild_id"])
+        for record in records
+        if bot.cache.get_guild(record["guild_id"]) and not bot.cache.get_role(record["role_id"])
+    }
+
+    deleted = 0
+    for guild_id in guild_ids:
+        try:
+            # Make sure the roles are actually gone and not just missing from the cache
+            role_ids = {role.id for role in await bot.rest.fetch_roles(guild_id)}
+            orphans = [button for button in await RoleButton.fetch_all(guild_id) if button.role_id not in role_ids]
+
+            if orphans:
+                deleted += len(await RoleButton.bulk_delete(guild_id, orphans))
+        except hikari.HTTPError as e:
+            logger.info(f"Failed to clean up orphaned rolebuttons in guild {guild_id}: {e}")
+        except Exception:
+            logger.exception(f"Unexpected error while cleaning up orphaned rolebuttons in guild {guild_id}")
+
+    if deleted:
+        logger.info(f"Deleted {deleted} orphaned rolebuttons.")
+
 
 class RoleButtonConfirmType(enum.Enum):
     """Types of confirmation prompts for rolebuttons."""
@@ -94,55 +200,37 @@ class RoleButtonConfirmModal(miru.Modal):
         )
 
 
-@role_buttons.listener(miru.ComponentInteractionCreateEvent, bind=True)
-async def rolebutton_listener(plugin: SnedPlugin, event: miru.ComponentInteractionCreateEvent) -> None:
-    """Statelessly listen for rolebutton interactions"""
+async def rolebutton_listener(event: miru.ComponentInteractionCreateEvent) -> None:
+    """Statelessly handle rolebutton interactions, routed here by the bot for custom_ids starting with 'RB:'"""
 
-    if not event.interaction.custom_id.startswith("RB:"):
+    try:
+        entry_id, role_id = unpack_custom_id(event.interaction.custom_id)
+    except ValueError:
         return
 
-    entry_id = int(event.interaction.custom_id.split(":")[1])
-    role_id = int(event.interaction.custom_id.split(":")[2])
-
     if not event.context.guild_id:
         return
 
-    role = plugin.app.cache.get_role(role_id)
+    # Reject spam clicks before doing any other work
+    await role_button_ratelimiter.acquire(event.context)
+    if role_button_ratelimiter.is_rate_limited(event.context):
+        await event.context.respond(embed=RATELIMITED_EMBED, flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    role = role_buttons.app.cache.get_role(role_id)
 
     if not role:
-        await event.context.respond(
-            embed=hikari.Embed(
-                title="❌ Orphaned",
-                description="The role this button was pointing to was deleted! Contact an administrator!",
-                color=0xFF0000,
-            ),
-            flags=hikari.MessageFlag.EPHEMERAL,
-        )
+        await event.context.respond(embed=ORPHANED_EMBED, flags=hikari.MessageFlag.EPHEMERAL)
+        # Remove the dead button in the background instead of handling every future click on it
+        _schedule_orphan_cleanup(event.context.guild_id, entry_id, role_id)
         return
 
+    # Discord resolves the bot's channel permissions and sends them along with the interaction,
+    # so there is no need to compute (or cache) them from the bot's roles here
     assert event.context.app_permissions is not None
 
     if not helpers.includes_permissions(event.context.app_permissions, hikari.Permissions.MANAGE_ROLES):
-        await event.context.respond(
-            embed=hikari.Embed(
-                title="❌ Missing Permissions",
-                description="Bot does not have `Manage Roles` permissions! Contact an administrator!",
-                color=0xFF0000,
-            ),
-            flags=hikari.MessageFlag.EPHEMERAL,
-        )
-        return
-
-    await role_button_ratelimiter.acquire(event.context)
-    if role_button_ratelimiter.is_rate_limited(event.context):
-        await event.context.respond(
-            embed=hikari.Embed(
-                title="❌ Slow Down!",
-                description="You are clicking too fast!",
-                color=0xFF0000,
-            ),
-            flags=hikari.MessageFlag.EPHEMERAL,
-        )
+        await event.context.respond(embed=MISSING_PERMISSIONS_EMBED, flags=hikari.MessageFlag.EPHEMERAL)
         return
 
     await event.context.defer(hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL)
@@ -152,25 +240,22 @@ async def rolebutton_listener(plugin: SnedPlugin, event: miru.ComponentInteracti
         role_button = await RoleButton.fetch(entry_id)
 
         if not role_button:  # This should theoretically never happen, but I do not trust myself
-            await event.context.respond(
-                embed=hikari.Embed(
-                    title="❌ Missing Data",
-                    description="The rolebutton you clicked on is missing data, or was improperly deleted! Contact an administrator!",
-                    color=0xFF0000,
-                ),
-                flags=hikari.MessageFlag.EPHEMERAL,
-            )
+            await event.context.respond(embed=MISSING_DATA_EMBED, flags=hikari.MessageFlag.EPHEMERAL)
             return
 
         if role.id in event.context.member.role_ids:
 
             if role_button.mode in [RoleButtonMode.TOGGLE, RoleButtonMode.REMOVE_ONLY]:
                 await event.context.member.remove_role(role, reason=f"Removed by role-button (ID: {entry_id})")
-                embed = hikari.Embed(
-                    title=f"✅ {role_button.remove_title or 'Role removed'}",
-                    description=f"{role_button.remove_description or f'Removed role: {role.mention}'}",
-                    color=0x77B255,
-                )
+                if not role_button.remove_title and not role_button.remove_description:
+                    embed = copy.copy(ROLE_REMOVED_EMBED)
+                    embed.description = f"Removed role: {role.mention}"
+                else:
+                    embed = hikari.Embed(
+                        title=f"✅ {role_button.remove_title or 'Role removed'}",
+                        description=f"{role_button.remove_description or f'Removed role: {role.mention}'}",
+                        color=0x77B255,
+                    )
             else:
                 embed = hikari.Embed(
                     title="❌ Role already added",
@@ -182,13 +267,19 @@ async def rolebutton_listener(plugin: SnedPlugin, event: miru.ComponentInteracti
 
             if role_button.mode in [RoleButtonMode.TOGGLE, RoleButtonMode.ADD_ONLY]:
                 await event.context.member.add_role(role, reason=f"Granted by role-button (ID: {entry_id})")
-                embed = hikari.Embed(
-                    title=f"✅ {role_button.add_title or 'Role added'}",
-                    description=f"{role_button.add_description or f'Added role: {role.mention}'}",
-                    color=0x77B255,
-                )
-                if not role_button.add_description and role_button.mode == RoleButtonMode.TOGGLE:
-                    embed.set_footer("To remove the role, click the button again!")
+                if not role_button.add_title and not role_button.add_description:
+                    embed = copy.copy(
+                        ROLE_ADDED_TOGGLE_EMBED if role_button.mode == RoleButtonMode.TOGGLE else ROLE_ADDED_EMBED
+                    )
+                    embed.description = f"Added role: {role.mention}"
+                else:
+                    embed = hikari.Embed(
+                        title=f"✅ {role_button.add_title or 'Role added'}",
+                        description=f"{role_button.add_description or f'Added role: {role.mention}'}",
+                        color=0x77B255,
+                    )
+                    if not role_button.add_description and role_button.mode == RoleButtonMode.TOGGLE:
+                        embed.set_footer("To remove the role, click the button again!")
             else:
                 embed = hikari.Embed(
                     title="❌ Role already removed",
@@ -199,14 +290,7 @@ async def rolebutton_listener(plugin: SnedPlugin, event: miru.ComponentInteracti
         await event.context.respond(embed=embed, flags=hikari.MessageFlag.EPHEMERAL)
 
     except (hikari.ForbiddenError, hikari.HTTPError):
-        await event.context.respond(
-            embed=hikari.Embed(
-                title="❌ Insufficient permissions",
-                description="Failed changing role due to an issue with permissions and/or role hierarchy! Please contact an administrator!",
-                color=0xFF0000,
-            ),
-            flags=hikari.MessageFlag.EPHEMERAL,
-        )
+        await event.context.respond(embed=INSUFFICIENT_PERMISSIONS_EMBED, flags=hikari.MessageFlag.EPHEMERAL)
 
 
 @role_buttons.command
@@ -237,10 +321,17 @@ async def rolebutton_list(ctx: SnedSlashContext) -> None:
         )
         return
 
+    # Resolve every distinct role & channel once, many buttons usually share the same ones
+    roles = {role_id: ctx.app.cache.get_role(role_id) for role_id in {button.role_id for button in buttons}}
+    channels = {
+        channel_id: ctx.app.cache.get_guild_channel(channel_id)
+        for channel_id in {button.channel_id for button in buttons}
+    }
+
     paginator = lightbulb.utils.StringPaginator(max_chars=500)
     for button in buttons:
-        role = ctx.app.cache.get_role(button.role_id)
-        channel = ctx.app.cache.get_guild_channel(button.channel_id)
+        role = roles[button.role_id]
+        channel = channels[button.channel_id]
 
         if role and channel:
             paginator.add_line(f"**#{button.id}** - {channel.mention} - {role.mention}")
@@ -359,7 +450,7 @@ async def rolebutton_edit(ctx: SnedSlashContext, **kwargs) -> None:
         params["mode"] = BUTTON_MODES[mode.split(" -")[0]]
 
     if emoji := params.get("emoji"):
-        params["emoji"] = hikari.Emoji.parse(emoji)
+        params["emoji"] = parse_emoji(emoji)
 
     if role := params.pop("role", None):
         if role.is_managed or role.is_premium_subscriber_role or role.id == ctx.guild_id:
@@ -510,7 +601,7 @@ async def rolebutton_add(
         )
         return
 
-    parsed_emoji = hikari.Emoji.parse(emoji)
+    parsed_emoji = parse_emoji(emoji)
     buttonstyle = BUTTON_STYLES[style.capitalize()]
 
     try:
@@ -583,9 +674,16 @@ async def rolebutton_setprompt(ctx: SnedSlashContext, button_id: int, prompt_typ
 
 def load(bot: SnedBot) -> None:
     bot.add_plugin(role_buttons)
+    bot.add_component_handler(CUSTOM_ID_PREFIX, rolebutton_listener)
+    role_buttons.d._cleanup_task = bot.create_task(_cleanup_orphans(bot))
 
 
 def unload(bot: SnedBot) -> None:
+    if role_buttons.d._cleanup_task:
+        role_buttons.d._cleanup_task.cancel()
+    for task in list(_orphan_cleanups.values()):
+        task.cancel()
+    bot.remove_component_handler(CUSTOM_ID_PREFIX)
     bot.remove_plugin(role_buttons)
 
 
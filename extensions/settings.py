@@ -430,6 +430,7 @@ Enabling **ephemeral responses** will show all moderation command responses in a
             (mod_settings.flags & ~flag).value if flag & mod_settings.flags else (mod_settings.flags | flag).value,
         )
         await self.app.db_cache.refresh(table="mod_config", guild_id=self.last_ctx.guild_id)
+        self.app.mod.invalidate_settings(self.last_ctx.guild_id)
 
         await self.settings_mod()
 
@@ -1276,7 +1277,7 @@ async def ask_settings(
         The query exceeded the given timeout.
     """
 
-    if return_type not in CONVERTER_TYPE_MAPPING.keys():
+    if return_type not in CONVERTER_TYPE_MAPPING:
         return TypeError(
             f"return_type must be of types: {' '.join(list(CONVERTER_TYPE_MAPPING.keys()))}, not {return_type}"  # type: ignore
         )
@@ -86,7 +86,7 @@ async def get_log_channel_ids_view(guild_id: int) -> t.Dict[str, t.Optional[int]
     log_channels = json.loads(records[0]["log_channels"]) if records and records[0]["log_channels"] else {}
 
     for log_event in userlog.d.valid_log_events:
-        if log_event not in log_channels.keys():
+        if log_event not in log_channels:
             log_channels[log_event] = None
 
     return log_channels
@@ -125,6 +125,36 @@ async def is_color_enabled(guild_id: int) -> bool:
 userlog.d.actions["is_color_enabled"] = is_color_enabled
 
 
+async def is_enabled(log_event: str, guild_id: int, bypass: bool = False) -> bool:
+    """Check if log_event would currently be logged anywhere in the given guild.
+    Useful to skip building expensive log content that would be discarded anyway.
+
+    Parameters
+    ----------
+    log_event : str
+        The log event to check.
+    guild_id : int
+        The ID of the guild.
+    bypass : bool, optional
+        If bypassing guild log freeze is desired, by default False
+
+    Returns
+    -------
+    bool
+        Whether the event has a log channel configured and logging is not frozen.
+    """
+    if not userlog.app.is_ready or not userlog.app.db_cache.is_ready:
+        return False
+
+    if guild_id in userlog.d.frozen_guilds and not bypass:
+        return False
+
+    return bool(await get_log_channel_id(log_event, guild_id))
+
+
+userlog.d.actions["is_enabled"] = is_enabled
+
+
 async def log(
     log_event: str,
     log_content: hikari.Embed,
@@ -813,9 +843,10 @@ async def member_update(plugin: SnedPlugin, event: hikari.MemberUpdateEvent) ->
     old_member = event.old_member
     member = event.member
 
-    if old_member.communication_disabled_until() != member.communication_disabled_until():
+    comms_disabled_until = member.communication_disabled_until()
+
+    if old_member.communication_disabled_until() != comms_disabled_until:
         """Timeout logging"""
-        comms_disabled_until = member.communication_disabled_until()
 
         entry = await find_auditlog_data(
             event, event_type=hikari.AuditLogEventType.MEMBER_UPDATE, user_id=event.user.id
@@ -920,6 +951,9 @@ async def member_update(plugin: SnedPlugin, event: hikari.MemberUpdateEvent) ->
 @userlog.listener(WarnCreateEvent, bind=True)
 async def warn_create(plugin: SnedPlugin, event: WarnCreateEvent) -> None:
 
+    if not await is_enabled("warn", event.guild_id):
+        return
+
     embed = hikari.Embed(
         title="⚠️ Warning issued",
         description=f"**{event.member}** has been warned by **{event.moderator}**.\n**Warns:** {event.warn_count}\n**Reason:** ```{event.reason}```",
@@ -928,14 +962,13 @@ async def warn_create(plugin: SnedPlugin, event: WarnCreateEvent) -> None:
 
     await log("warn", embed, event.guild_id)
 
-    await plugin.app.mod.add_note(
-        event.member, event.member.guild_id, f"⚠️ **Warned by {event.moderator}:** {event.reason}"
-    )
-
 
 @userlog.listener(WarnRemoveEvent, bind=True)
 async def warn_remove(plugin: SnedPlugin, event: WarnRemoveEvent) -> None:
 
+    if not await is_enabled("warn", event.guild_id):
+        return
+
     embed = hikari.Embed(
         title="⚠️ Warning removed",
         description=f"A warning was removed from **{event.member}** by **{event.moderator}**.\n**Warns:** {event.warn_count}\n**Reason:** ```{event.reason}```",
@@ -944,14 +977,13 @@ async def warn_remove(plugin: SnedPlugin, event: WarnRemoveEvent) -> None:
 
     await log("warn", embed, event.guild_id)
 
-    await plugin.app.mod.add_note(
-        event.member, event.member.guild_id, f"⚠️ **1 Warning removed by {event.moderator}:** {event.reason}"
-    )
-
 
 @userlog.listener(WarnsClearEvent, bind=True)
 async def warns_clear(plugin: SnedPlugin, event: WarnsClearEvent) -> None:
 
+    if not await is_enabled("warn", event.guild_id):
+        return
+
     embed = hikari.Embed(
         title="⚠️ Warnings cleared",
         description=f"Warnings cleared for **{event.member}** by **{event.moderator}**.\n**Reason:** ```{event.reason}```",
@@ -960,14 +992,14 @@ async def warns_clear(plugin: SnedPlugin, event: WarnsClearEvent) -> None:
 
     await log("warn", embed, event.guild_id)
 
-    await plugin.app.mod.add_note(
-        event.member, event.member.guild_id, f"⚠️ **Warnings cleared for {event.moderator}:** {event.reason}"
-    )
-
 
 @userlog.listener(AutoModMessageFlagEvent, bind=True)
 async def flag_message(plugin: SnedPlugin, event: AutoModMessageFlagEvent) -> None:
 
+    # Flags can be frequent during spam, avoid resolving the user if the result would be discarded
+    if not await is_enabled("flags", event.guild_id):
+        return
+
     user_id = hikari.Snowflake(event.user)
 
     reason = helpers.format_reason(event.reason, max_length=1500)
@@ -1002,6 +1034,9 @@ async def massban_execute(event: MassBanEvent) -> None:
 
 @userlog.listener(RoleButtonCreateEvent)
 async def rolebutton_create(event: RoleButtonCreateEvent) -> None:
+    if not await is_enabled("roles", event.guild_id):
+        return
+
     moderator = f"{event.moderator} ({event.moderator.id})" if event.moderator else "Unknown"
 
     log_embed = hikari.Embed(
@@ -1014,6 +1049,9 @@ async def rolebutton_create(event: RoleButtonCreateEvent) -> None:
 
 @userlog.listener(RoleButtonDeleteEvent)
 async def rolebutton_delete(event: RoleButtonDeleteEvent) -> None:
+    if not await is_enabled("roles", event.guild_id):
+        return
+
     moderator = f"{event.moderator} ({event.moderator.id})" if event.moderator else "Unknown"
 
     log_embed = hikari.Embed(
@@ -1026,6 +1064,9 @@ async def rolebutton_delete(event: RoleButtonDeleteEvent) -> None:
 
 @userlog.listener(RoleButtonUpdateEvent)
 async def rolebutton_update(event: RoleButtonUpdateEvent) -> None:
+    if not await is_enabled("roles", event.guild_id):
+        return
+
     moderator = f"{event.moderator} ({event.moderator.id})" if event.moderator else "Unknown"
 
     log_embed = hikari.Embed(
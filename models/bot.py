@@ -23,6 +23,8 @@ from utils.tasks import IntervalLoop
 
 from .context import *
 
+ComponentHandlerT = t.Callable[[miru.ComponentInteractionCreateEvent], t.Awaitable[None]]
+
 
 async def is_not_blacklisted(ctx: SnedContext) -> bool:
     """Evaluate if the user is blacklisted or not.
@@ -97,6 +99,9 @@ class SnedBot(lightbulb.BotApp):
             banner=None,
         )
 
+        # Mapping of custom_id prefix: handler for stateless component interactions
+        self._component_handlers: t.Dict[str, ComponentHandlerT] = {}
+
         # Initizaling configuration and database
         self._config = config
         self._db = Database(self)
@@ -196,6 +201,38 @@ class SnedBot(lightbulb.BotApp):
         self.subscribe(hikari.StoppedEvent, self.on_stop)
         self.subscribe(hikari.GuildJoinEvent, self.on_guild_join)
         self.subscribe(hikari.GuildLeaveEvent, self.on_guild_leave)
+        self.subscribe(miru.ComponentInteractionCreateEvent, self.on_component_interaction)
+
+    def add_component_handler(self, prefix: str, handler: ComponentHandlerT) -> None:
+        """Register a handler for stateless component interactions.
+
+        Parameters
+        ----------
+        prefix : str
+            The custom_id prefix to route to the handler, without the trailing ':'.
+            Only custom_ids in the format '{prefix}:...' will be dispatched to it.
+        handler : ComponentHandlerT
+            The coroutine function to call with the interaction event.
+
+        Raises
+        ------
+        ValueError
+            A handler is already registered for this prefix.
+        """
+        if prefix in self._component_handlers:
+            raise ValueError(f"A component handler is already registered for prefix '{prefix}'.")
+
+        self._component_handlers[prefix] = handler
+
+    def remove_component_handler(self, prefix: str) -> None:
+        """Remove the handler registered for a custom_id prefix, if any.
+
+        Parameters
+        ----------
+        prefix : str
+            The custom_id prefix the handler was registered with.
+        """
+        self._component_handlers.pop(prefix, None)
 
     async def wait_until_started(self) -> None:
         """
@@ -292,6 +329,15 @@ class SnedBot(lightbulb.BotApp):
         await self.db.close()
         logging.info("Closed database connection.")
 
+    async def on_component_interaction(self, event: miru.ComponentInteractionCreateEvent) -> None:
+        prefix, sep, _ = event.custom_id.partition(":")
+
+        if not sep:
+            return
+
+        if handler := self._component_handlers.get(prefix):
+            await handler(event)
+
     async def on_message(self, event: hikari.MessageCreateEvent) -> None:
         if not event.content:
             return
@@ -32,7 +32,7 @@ async def is_above_target(ctx: SnedContext) -> bool:
     if guild and guild.owner_id == ctx.options.user.id:
         raise BotRoleHierarchyError("Cannot execute on the owner of the guild.")
 
-    me = ctx.app.cache.get_member(ctx.guild_id, ctx.app.user_id)
+    me = ctx.me
     assert me is not None
 
     if isinstance(ctx.options.user, hikari.Member):
@@ -127,7 +127,7 @@ async def _bot_has_permissions(ctx: SnedContext, *, perms: hikari.Permissions) -
             raise lightbulb.InsufficientCache(
                 "Some objects required for this check could not be resolved from the cache."
             )
-        member = guild.get_my_member()
+        member = ctx.me
         if member is None:
             raise lightbulb.InsufficientCache(
                 "Some objects required for this check could not be resolved from the cache."
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import typing as t
 
 import hikari
@@ -15,6 +17,8 @@ __all__ = ["SnedContext", "SnedSlashContext", "SnedMessageContext", "SnedUserCon
 if t.TYPE_CHECKING:
     from .bot import SnedBot
 
+T = t.TypeVar("T")
+
 
 class ConfirmView(AuthorOnlyView):
     """View that drives the confirm prompt button logic."""
@@ -166,6 +170,38 @@ class SnedContext(lightbulb.Context):
 
         return await self.respond(*args, flags=flags, **kwargs)
 
+    async def mod_defer_if_slow(self, awaitable: t.Awaitable[T], *, timeout: float = 1.5) -> T:
+        """Await an awaitable, only deferring the response if it does not finish within the given timeout.
+        This saves a request for the deferral when the action finishes quickly. Deferral respects moderation settings.
+
+        Parameters
+        ----------
+        awaitable : t.Awaitable[T]
+            The awaitable to wait for.
+        timeout : float, optional
+            The amount of seconds to wait before deferring, by default 1.5
+
+        Returns
+        -------
+        T
+            The result of the awaitable.
+        """
+        task = asyncio.ensure_future(awaitable)
+        done, _ = await asyncio.wait((task,), timeout=timeout)
+
+        if not done:
+            await self.mod_respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE)
+
+        return await task
+
+    @functools.cached_property
+    def me(self) -> t.Optional[hikari.Member]:
+        """The bot's own member object in the guild this context was invoked in, if any.
+        Resolved from the cache once and kept for the lifetime of the context."""
+        if self.guild_id is None:
+            return None
+        return self.app.cache.get_member(self.guild_id, self.app.user_id)
+
     @property
     def app(self) -> SnedBot:
         return super().app  # type: ignore
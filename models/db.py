@@ -17,6 +17,10 @@ if t.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# The bot only issues a fixed set of queries, so prepared statements are kept around instead of expiring.
+STATEMENT_CACHE_SIZE = 256
+MAX_CACHED_STATEMENT_LIFETIME = 0
+
 
 class Database:
     """A database object that wraps an asyncpg pool and provides additional methods for convenience."""
@@ -80,7 +84,11 @@ class Database:
         if self._is_closed:
             raise DatabaseStateConflictError("The database is closed.")
 
-        self._pool = await asyncpg.create_pool(dsn=self.dsn)
+        self._pool = await asyncpg.create_pool(
+            dsn=self.dsn,
+            statement_cache_size=STATEMENT_CACHE_SIZE,
+            max_cached_statement_lifetime=MAX_CACHED_STATEMENT_LIFETIME,
+        )
 
     async def close(self) -> None:
         """Close the connection pool."""
@@ -60,6 +60,66 @@ class DatabaseUser(DatabaseModel):
             json.dumps(self.data),
         )
 
+    @classmethod
+    async def append_note(
+        cls,
+        user: hikari.SnowflakeishOr[hikari.PartialUser],
+        guild: hikari.SnowflakeishOr[hikari.PartialGuild],
+        note: str,
+    ) -> None:
+        """Append a journal entry to a user in a single statement, creating the user if not present.
+
+        Parameters
+        ----------
+        user : hikari.SnowflakeishOr[hikari.PartialUser]
+            The user whose journal should be updated.
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild the user belongs to.
+        note : str
+            The journal entry to append, as it should be stored.
+        """
+
+        await cls._db.execute(
+            """
+            INSERT INTO users (user_id, guild_id, notes)
+            VALUES ($1, $2, ARRAY[$3::text])
+            ON CONFLICT (user_id, guild_id) DO
+            UPDATE SET notes = array_append(users.notes, $3::text)""",
+            hikari.Snowflake(user),
+            hikari.Snowflake(guild),
+            note,
+        )
+
+    @classmethod
+    async def clear_warns(
+        cls,
+        user: hikari.SnowflakeishOr[hikari.PartialUser],
+        guild: hikari.SnowflakeishOr[hikari.PartialGuild],
+        note: str,
+    ) -> None:
+        """Reset a user's warnings and append a journal entry in a single statement, creating the user if not present.
+
+        Parameters
+        ----------
+        user : hikari.SnowflakeishOr[hikari.PartialUser]
+            The user whose warnings should be cleared.
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild the user belongs to.
+        note : str
+            The journal entry to append, as it should be stored.
+        """
+
+        await cls._db.execute(
+            """
+            INSERT INTO users (user_id, guild_id, warns, notes)
+            VALUES ($1, $2, 0, ARRAY[$3::text])
+            ON CONFLICT (user_id, guild_id) DO
+            UPDATE SET warns = 0, notes = array_append(users.notes, $3::text)""",
+            hikari.Snowflake(user),
+            hikari.Snowflake(guild),
+            note,
+        )
+
     @classmethod
     async def fetch(
         cls, user: hikari.SnowflakeishOr[hikari.PartialUser], guild: hikari.SnowflakeishOr[hikari.PartialGuild]
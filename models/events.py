@@ -17,7 +17,7 @@ class SnedEvent(hikari.Event):
     Base event for any custom event implemented by this application.
     """
 
-    ...
+    __slots__ = ()
 
 
 class SnedGuildEvent(SnedEvent):
@@ -25,6 +25,8 @@ class SnedGuildEvent(SnedEvent):
     Base event for any custom event that occurs within the context of a guild.
     """
 
+    __slots__ = ()
+
     app: SnedBot
     _guild_id: hikari.Snowflakeish
 
@@ -68,15 +70,18 @@ class SnedGuildEvent(SnedEvent):
         return self.app.cache.get_guild(self.guild_id)
 
 
-@attr.define()
 class TimerCompleteEvent(SnedGuildEvent):
     """
     Dispatched when a scheduled timer has expired.
     """
 
-    app: SnedBot
-    timer: Timer
-    _guild_id: hikari.Snowflakeish
+    # Dispatched for every expiring timer, so this is kept as a plain slotted class
+    __slots__ = ("app", "timer", "_guild_id")
+
+    def __init__(self, app: SnedBot, timer: Timer, guild_id: hikari.Snowflakeish) -> None:
+        self.app = app
+        self.timer = timer
+        self._guild_id = guild_id
 
 
 @attr.define()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
 import enum
 import logging
+import time
 import typing as t
 
 import attr
@@ -41,6 +43,28 @@ class ActionType(enum.Enum):
     WARN = "Warn"
 
 
+TYPES_CONJ: t.Dict[ActionType, str] = {
+    ActionType.WARN: "warned in",
+    ActionType.TIMEOUT: "timed out in",
+    ActionType.KICK: "kicked from",
+    ActionType.BAN: "banned from",
+    ActionType.SOFTBAN: "soft-banned from",
+    ActionType.TEMPBAN: "temp-banned from",
+}
+"""Verbs used when notifying a user of a moderation action taken against them."""
+
+DM_TITLE_TEMPLATES: t.Dict[ActionType, str] = {
+    action_type: f"❗ You have been {verb} **{{guild_name}}**" for action_type, verb in TYPES_CONJ.items()
+}
+"""Title templates of the DM sent to a user when a moderation action is taken against them."""
+
+DM_DESCRIPTION_TEMPLATES: t.Dict[ActionType, str] = {
+    action_type: f"You have been {verb} **{{guild_name}}**.\n**Reason:** ```{{reason}}```"
+    for action_type, verb in TYPES_CONJ.items()
+}
+"""Description templates of the DM sent to a user when a moderation action is taken against them."""
+
+
 class ModerationFlags(enum.Flag):
     """A set of flags governing behaviour of moderation actions."""
 
@@ -54,7 +78,7 @@ class ModerationFlags(enum.Flag):
     """Responses to moderation actions should be done ephemerally."""
 
 
-@attr.define()
+@attr.frozen()
 class ModerationSettings:
     """Settings for moderation actions."""
 
@@ -62,7 +86,34 @@ class ModerationSettings:
     """Flags governing behaviour of moderation actions."""
 
 
+DEFAULT_MOD_SETTINGS = ModerationSettings()
+"""The moderation settings used by guilds that have not configured them. Shared, as settings are immutable."""
+
+
 MAX_TIMEOUT_SECONDS = 2246400  # Duration of segments to break timeouts up to
+SETTINGS_CACHE_TTL = 60.0  # Seconds to keep resolved moderation settings in memory for
+SETTINGS_CACHE_MAXSIZE = 1024  # Maximum amount of guilds to keep resolved moderation settings in memory for
+
+
+def add_note_to_user(db_user: DatabaseUser, note: str) -> None:
+    """Append a new journal entry to a user in-place, without writing it to the database.
+
+    Parameters
+    ----------
+    db_user : DatabaseUser
+        The user whose journal should be updated.
+    note : str
+        The contents of the new journal entry.
+    """
+    notes = db_user.notes if db_user.notes else []
+    notes.append(_format_note(note))
+    db_user.notes = notes
+
+
+def _format_note(note: str) -> str:
+    """Format a journal entry the way it is stored in the database."""
+    note = helpers.format_reason(note, max_length=256)
+    return f"{helpers.format_dt(helpers.utcnow(), style='d')}: {note}"
 
 
 class ModActions:
@@ -71,11 +122,14 @@ class ModActions:
 
     def __init__(self, bot: SnedBot) -> None:
         self.app = bot
+        # Mapping of guild_id: (time of caching, settings)
+        self._settings_cache: t.Dict[hikari.Snowflake, t.Tuple[float, ModerationSettings]] = {}
         self.app.subscribe(TimerCompleteEvent, self.timeout_extend)
         self.app.subscribe(hikari.MemberCreateEvent, self.reapply_timeout_extensions)
         self.app.subscribe(hikari.MemberUpdateEvent, self.remove_timeout_extensions)
         self.app.subscribe(TimerCompleteEvent, self.tempban_expire)
-        self.app.subscribe(miru.ComponentInteractionCreateEvent, self.handle_mod_buttons)
+        self.app.add_component_handler("UNBAN", self.handle_mod_buttons)
+        self.app.add_component_handler("JOURNAL", self.handle_mod_buttons)
 
     async def get_settings(self, guild: hikari.SnowflakeishOr[hikari.PartialGuild]) -> ModerationSettings:
         """Get moderation settings for a guild.
@@ -87,14 +141,38 @@ class ModActions:
 
         Returns
         -------
-        t.Dict[str, bool]
+        ModerationSettings
             The guild's moderation settings.
         """
-        records = await self.app.db_cache.get(table="mod_config", guild_id=hikari.Snowflake(guild))
-        if records:
-            return ModerationSettings(flags=ModerationFlags(records[0].get("flags")))
+        guild_id = hikari.Snowflake(guild)
+
+        entry = self._settings_cache.get(guild_id)
+        if entry and time.monotonic() - entry[0] < SETTINGS_CACHE_TTL:
+            return entry[1]
+
+        records = await self.app.db_cache.get(table="mod_config", guild_id=guild_id)
+        flags = records[0].get("flags") if records else None
+        # Explicit None check, as a stored value of 0 (all flags disabled) is valid and must not fall back to defaults
+        settings = ModerationSettings(flags=ModerationFlags(flags)) if flags is not None else DEFAULT_MOD_SETTINGS
+
+        if self.app.db_cache.is_ready:
+            self._settings_cache.pop(guild_id, None)
+            if len(self._settings_cache) >= SETTINGS_CACHE_MAXSIZE:
+                # Entries are kept in insertion order, so this evicts the least recently cached guild
+                del self._settings_cache[next(iter(self._settings_cache))]
+            self._settings_cache[guild_id] = (time.monotonic(), settings)
+
+        return settings
 
-        return ModerationSettings()
+    def invalidate_settings(self, guild: hikari.SnowflakeishOr[hikari.PartialGuild]) -> None:
+        """Discard the cached moderation settings of a guild. Should be called after modifying them.
+
+        Parameters
+        ----------
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild to invalidate moderation settings for.
+        """
+        self._settings_cache.pop(hikari.Snowflake(guild), None)
 
     async def pre_mod_actions(
         self,
@@ -106,32 +184,29 @@ class ModActions:
         """
         Actions that need to be executed before a moderation action takes place.
         """
-        helpers.format_reason(reason, max_length=1500)
+        # Only members can be DMed, so there is no need to look up settings otherwise
+        if not isinstance(target, hikari.Member):
+            return
+
         guild_id = hikari.Snowflake(guild)
         settings = await self.get_settings(guild_id)
-        types_conj = {
-            ActionType.WARN: "warned in",
-            ActionType.TIMEOUT: "timed out in",
-            ActionType.KICK: "kicked from",
-            ActionType.BAN: "banned from",
-            ActionType.SOFTBAN: "soft-banned from",
-            ActionType.TEMPBAN: "temp-banned from",
-        }
-
-        if settings.flags & ModerationFlags.DM_USERS_ON_PUNISH and isinstance(target, hikari.Member):
-            gateway_guild = self.app.cache.get_guild(guild_id)
-            assert isinstance(gateway_guild, hikari.GatewayGuild)
-            guild_name = gateway_guild.name if gateway_guild else "Unknown server"
-            try:
-                await target.send(
-                    embed=hikari.Embed(
-                        title=f"❗ You have been {types_conj[action_type]} **{guild_name}**",
-                        description=f"You have been {types_conj[action_type]} **{guild_name}**.\n**Reason:** ```{reason}```",
-                        color=const.ERROR_COLOR,
-                    )
+
+        if not settings.flags & ModerationFlags.DM_USERS_ON_PUNISH:
+            return
+
+        gateway_guild = self.app.cache.get_guild(guild_id)
+        assert isinstance(gateway_guild, hikari.GatewayGuild)
+        guild_name = gateway_guild.name if gateway_guild else "Unknown server"
+        try:
+            await target.send(
+                embed=hikari.Embed(
+                    title=DM_TITLE_TEMPLATES[action_type].format(guild_name=guild_name),
+                    description=DM_DESCRIPTION_TEMPLATES[action_type].format(guild_name=guild_name, reason=reason),
+                    color=const.ERROR_COLOR,
                 )
-            except (hikari.ForbiddenError, hikari.HTTPError):
-                raise DMFailedError("Failed delivering direct message to user.")
+            )
+        except (hikari.ForbiddenError, hikari.HTTPError):
+            raise DMFailedError("Failed delivering direct message to user.")
 
     async def post_mod_actions(
         self,
@@ -149,9 +224,6 @@ class ModActions:
         """Handle buttons related to moderation quick-actions."""
 
         # Format: ACTION:<user_id>:<moderator_id>
-        if not event.custom_id.startswith(("UNBAN:", "JOURNAL:")):
-            return
-
         moderator_id = hikari.Snowflake(event.custom_id.split(":")[2])
 
         if moderator_id != event.user.id:
@@ -243,24 +315,26 @@ class ModActions:
             if not helpers.can_harm(me, member, hikari.Permissions.MODERATE_MEMBERS):
                 return
 
-            if expiry - helpers.utcnow().timestamp() > MAX_TIMEOUT_SECONDS:
+            now = helpers.utcnow()
+            remaining = expiry - now.timestamp()
+
+            if remaining > MAX_TIMEOUT_SECONDS:
+                segment_end = now + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS)
 
                 await event.app.scheduler.create_timer(
-                    helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS),
+                    segment_end,
                     TimerEvent.TIMEOUT_EXTEND,
                     timer.guild_id,
                     member,
                     notes=timer.notes,
                 )
                 await member.edit(
-                    communication_disabled_until=helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS),
+                    communication_disabled_until=segment_end,
                     reason="Automatic timeout extension applied.",
                 )
 
             else:
-                timeout_for = helpers.utcnow() + datetime.timedelta(
-                    seconds=expiry - round(helpers.utcnow().timestamp())
-                )
+                timeout_for = now + datetime.timedelta(seconds=round(remaining))
                 await member.edit(
                     communication_disabled_until=timeout_for, reason="Automatic timeout extension applied."
                 )
@@ -268,7 +342,7 @@ class ModActions:
         else:
             db_user = await DatabaseUser.fetch(timer.user_id, timer.guild_id)
 
-            if DatabaseUserFlag.TIMEOUT_ON_JOIN ^ db_user.flags:
+            if DatabaseUserFlag.TIMEOUT_ON_JOIN not in db_user.flags:
                 db_user.flags = db_user.flags | DatabaseUserFlag.TIMEOUT_ON_JOIN
                 db_user.data["timeout_expiry"] = expiry
                 await db_user.update()
@@ -285,33 +359,38 @@ class ModActions:
 
         db_user = await DatabaseUser.fetch(event.member.id, event.guild_id)
 
-        if db_user.flags ^ DatabaseUserFlag.TIMEOUT_ON_JOIN:
+        if DatabaseUserFlag.TIMEOUT_ON_JOIN not in db_user.flags:
             return
 
         expiry = db_user.data.pop("timeout_expiry", 0)
-        db_user.flags = db_user.flags ^ DatabaseUserFlag.TIMEOUT_ON_JOIN
+        db_user.flags = db_user.flags & ~DatabaseUserFlag.TIMEOUT_ON_JOIN
         await db_user.update()
 
-        if expiry - helpers.utcnow().timestamp() < 0:
+        now = helpers.utcnow()
+        remaining = expiry - now.timestamp()
+
+        if remaining < 0:
             # If this is in the past already
             return
 
-        if expiry - helpers.utcnow().timestamp() > MAX_TIMEOUT_SECONDS:
+        if remaining > MAX_TIMEOUT_SECONDS:
+            segment_end = now + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS)
+
             await self.app.scheduler.create_timer(
-                helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS),
+                segment_end,
                 TimerEvent.TIMEOUT_EXTEND,
                 event.member.guild_id,
                 event.member,
                 notes=str(expiry),
             )
             await event.member.edit(
-                communication_disabled_until=helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS),
+                communication_disabled_until=segment_end,
                 reason="Automatic timeout extension applied.",
             )
 
         else:
             await event.member.edit(
-                communication_disabled_until=helpers.utcnow() + datetime.timedelta(seconds=expiry),
+                communication_disabled_until=now + datetime.timedelta(seconds=remaining),
                 reason="Automatic timeout extension applied.",
             )
 
@@ -322,22 +401,14 @@ class ModActions:
         if not event.old_member:
             return
 
-        if event.old_member.communication_disabled_until() == event.member.communication_disabled_until():
+        # Only act if the timeout was just lifted, the old member is only checked if the new one is not timed out
+        if event.member.communication_disabled_until() is not None:
             return
 
-        if event.member.communication_disabled_until() is None:
-            records = await self.app.db.fetch(
-                """SELECT id FROM timers WHERE guild_id = $1 AND user_id = $2 AND event = $3""",
-                event.guild_id,
-                event.member.id,
-                TimerEvent.TIMEOUT_EXTEND.value,
-            )
-
-            if not records:
-                return
+        if event.old_member.communication_disabled_until() is None:
+            return
 
-            for record in records:
-                await self.app.scheduler.cancel_timer(record.get("id"), event.guild_id)
+        await self.app.scheduler.cancel_timers_bulk(event.guild_id, event.member, TimerEvent.TIMEOUT_EXTEND)
 
     async def tempban_expire(self, event: TimerCompleteEvent) -> None:
         """Handle tempban timer expiry and unban user."""
@@ -392,15 +463,7 @@ class ModActions:
             The contents of the new journal entry.
         """
 
-        note = helpers.format_reason(note, max_length=256)
-
-        db_user = await DatabaseUser.fetch(hikari.Snowflake(user), hikari.Snowflake(guild))
-
-        notes = db_user.notes if db_user.notes else []
-        notes.append(f"{helpers.format_dt(helpers.utcnow(), style='d')}: {note}")
-        db_user.notes = notes
-
-        await db_user.update()
+        await DatabaseUser.append_note(user, guild, _format_note(note))
 
     async def clear_notes(
         self, user: hikari.SnowflakeishOr[hikari.PartialUser], guild: hikari.SnowflakeishOr[hikari.Guild]
@@ -438,12 +501,13 @@ class ModActions:
         hikari.Embed
             The response to show to the invoker.
         """
+        reason = helpers.format_reason(reason, max_length=1000)
+
         db_user = await DatabaseUser.fetch(member.id, member.guild_id)
         db_user.warns += 1
+        add_note_to_user(db_user, f"⚠️ **Warned by {moderator}:** {reason}")
         await db_user.update()
 
-        reason = helpers.format_reason(reason, max_length=1000)
-
         embed = hikari.Embed(
             title="⚠️ Warning issued",
             description=f"**{member}** has been warned by **{moderator}**.\n**Reason:** ```{reason}```",
@@ -480,13 +544,13 @@ class ModActions:
         hikari.Embed
             The response to show to the invoker.
         """
-        db_user = await DatabaseUser.fetch(member, member.guild_id)
-        db_user.warns = 0
-        await db_user.update()
-
         reason = helpers.format_reason(reason)
 
-        await self.app.dispatch(WarnsClearEvent(self.app, member.guild_id, member, moderator, db_user.warns, reason))
+        await DatabaseUser.clear_warns(
+            member, member.guild_id, _format_note(f"⚠️ **Warnings cleared for {moderator}:** {reason}")
+        )
+
+        await self.app.dispatch(WarnsClearEvent(self.app, member.guild_id, member, moderator, 0, reason))
 
         return hikari.Embed(
             title="✅ Warnings cleared",
@@ -522,11 +586,12 @@ class ModActions:
                 color=const.ERROR_COLOR,
             )
 
+        reason = helpers.format_reason(reason)
+
         db_user.warns -= 1
+        add_note_to_user(db_user, f"⚠️ **1 Warning removed by {moderator}:** {reason}")
         await db_user.update()
 
-        reason = helpers.format_reason(reason)
-
         await self.app.dispatch(WarnRemoveEvent(self.app, member.guild_id, member, moderator, db_user.warns, reason))
 
         return hikari.Embed(
@@ -561,7 +626,7 @@ class ModActions:
             The response to display to the user.
         """
         raw_reason = helpers.format_reason(reason, max_length=1500)
-        reason = helpers.format_reason(reason, moderator, max_length=512)
+        reason = helpers.format_reason(raw_reason, moderator, max_length=512)
 
         me = self.app.cache.get_member(member.guild_id, self.app.user_id)
         assert me is not None
@@ -574,26 +639,34 @@ class ModActions:
             color=const.ERROR_COLOR,
         )
 
+        # The member stays in the guild after a timeout, so the DM can be sent alongside the REST call
+        dm_task = asyncio.create_task(
+            self.pre_mod_actions(member.guild_id, member, ActionType.TIMEOUT, reason=raw_reason)
+        )
+
         try:
-            await self.pre_mod_actions(member.guild_id, member, ActionType.TIMEOUT, reason=raw_reason)
-        except DMFailedError:
-            embed.set_footer("Failed sending DM to user.")
+            segment_end = helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS)
 
-        if duration > helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS):
-            await self.app.scheduler.create_timer(
-                helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS),
-                TimerEvent.TIMEOUT_EXTEND,
-                member.guild_id,
-                member,
-                notes=str(round(duration.timestamp())),
-            )
-            await member.edit(
-                communication_disabled_until=helpers.utcnow() + datetime.timedelta(seconds=MAX_TIMEOUT_SECONDS),
-                reason=reason,
-            )
+            if duration > segment_end:
+                await self.app.scheduler.create_timer(
+                    segment_end,
+                    TimerEvent.TIMEOUT_EXTEND,
+                    member.guild_id,
+                    member,
+                    notes=str(round(duration.timestamp())),
+                )
+                await member.edit(
+                    communication_disabled_until=segment_end,
+                    reason=reason,
+                )
 
-        else:
-            await member.edit(communication_disabled_until=duration, reason=reason)
+            else:
+                await member.edit(communication_disabled_until=duration, reason=reason)
+        finally:
+            try:
+                await dm_task
+            except DMFailedError:
+                embed.set_footer("Failed sending DM to user.")
 
         await self.post_mod_actions(member.guild_id, member, ActionType.TIMEOUT, reason=raw_reason)
         return embed
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import base64
+import binascii
 import enum
+import functools
+import struct
 import typing as t
 
 import hikari
@@ -23,6 +27,100 @@ class RoleButtonMode(enum.IntEnum):
     REMOVE_ONLY = 2
 
 
+# Queries issued on the rolebutton hot paths, kept as constants so every call hits
+# the same prepared statement in asyncpg's statement cache (see models.db.STATEMENT_CACHE_SIZE)
+_SQL_SELECT_BUTTON_ROLE = """SELECT * FROM button_roles WHERE entry_id = $1"""
+_SQL_INSERT_BUTTON_ROLE = """
+INSERT INTO button_roles (guild_id, channel_id, msg_id, emoji, label, style, mode, role_id)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+RETURNING entry_id
+"""
+_SQL_DELETE_BUTTON_ROLE = """DELETE FROM button_roles WHERE guild_id = $1 AND entry_id = $2"""
+_SQL_DELETE_BUTTON_ROLES = """DELETE FROM button_roles WHERE guild_id = $1 AND entry_id = ANY($2::int[])"""
+
+# The custom_id prefix of all rolebuttons, the component router dispatches on this
+CUSTOM_ID_PREFIX = "RB"
+_CUSTOM_ID_START = CUSTOM_ID_PREFIX + ":"
+
+# entry_id as u32 followed by role_id as u64, 12 bytes -> 16 base64 characters with no padding
+_CUSTOM_ID_STRUCT = struct.Struct("<IQ")
+
+
+def pack_custom_id(entry_id: int, role_id: int) -> str:
+    """Pack a rolebutton's entry_id and role_id into a compact custom_id.
+
+    Parameters
+    ----------
+    entry_id : int
+        The ID of the rolebutton.
+    role_id : int
+        The ID of the role handed out by the rolebutton.
+
+    Returns
+    -------
+    str
+        The custom_id to attach to the button.
+    """
+    return _CUSTOM_ID_START + base64.urlsafe_b64encode(_CUSTOM_ID_STRUCT.pack(entry_id, role_id)).decode()
+
+
+def unpack_custom_id(custom_id: str) -> t.Tuple[int, int]:
+    """Unpack the entry_id and role_id from a rolebutton's custom_id.
+
+    Both the packed format and the legacy 'RB:{entry_id}:{role_id}' format are understood,
+    as buttons created before the packed format was introduced still exist on messages.
+
+    Parameters
+    ----------
+    custom_id : str
+        The custom_id of the button, including the 'RB:' prefix.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The entry_id and role_id of the rolebutton.
+
+    Raises
+    ------
+    ValueError
+        The custom_id is malformed.
+    """
+    token = custom_id[len(_CUSTOM_ID_START) :]
+
+    if ":" in token:  # Legacy format
+        raw_entry_id, raw_role_id = token.split(":", 1)
+        return int(raw_entry_id), int(raw_role_id)
+
+    try:
+        return _CUSTOM_ID_STRUCT.unpack(base64.urlsafe_b64decode(token))
+    except (struct.error, binascii.Error) as e:
+        raise ValueError(f"Malformed rolebutton custom_id: {custom_id}") from e
+
+
+@functools.lru_cache(maxsize=256)
+def parse_emoji(emoji: str) -> hikari.Emoji:
+    """Parse an emoji from a string, caching the result as the same few emojis are used across many rolebuttons.
+
+    Parameters
+    ----------
+    emoji : str
+        The string to parse, either a unicode emoji or a custom emoji mention.
+
+    Returns
+    -------
+    hikari.Emoji
+        The parsed emoji object. This is shared between calls and must not be mutated.
+    """
+    return hikari.Emoji.parse(emoji)
+
+
+def _iter_custom_ids(message: hikari.Message) -> t.Iterator[t.Optional[str]]:
+    """Iterate over the custom_ids of all components on a message without building a view."""
+    for row in message.components:
+        for component in row.components:
+            yield getattr(component, "custom_id", None)
+
+
 class RoleButton(DatabaseModel):
     def __init__(
         self,
@@ -46,7 +144,7 @@ class RoleButton(DatabaseModel):
         self._guild_id = guild_id
         self._channel_id = channel_id
         self._message_id = message_id
-        self._custom_id = f"RB:{id}:{role_id}"
+        self._custom_id = pack_custom_id(id, role_id)
         # May be changed
         self.mode = mode
         self.emoji = emoji
@@ -78,6 +176,12 @@ class RoleButton(DatabaseModel):
     def custom_id(self) -> str:
         return self._custom_id
 
+    @property
+    def _custom_ids(self) -> t.Tuple[str, str]:
+        """All custom_ids this button may be attached with, including the legacy format."""
+        role_id = unpack_custom_id(self._custom_id)[1]
+        return (self._custom_id, f"{_CUSTOM_ID_START}{self.id}:{role_id}")
+
     @classmethod
     async def fetch(cls, id: int) -> t.Optional[RoleButton]:
         """Fetch a rolebutton stored in the database by ID.
@@ -93,7 +197,7 @@ class RoleButton(DatabaseModel):
             The resolved rolebutton object, if found.
         """
 
-        record = await cls._db.fetchrow("""SELECT * FROM button_roles WHERE entry_id = $1""", id)
+        record = await cls._db.fetchrow(_SQL_SELECT_BUTTON_ROLE, id)
         if not record:
             return None
 
@@ -102,7 +206,7 @@ class RoleButton(DatabaseModel):
             guild_id=hikari.Snowflake(record.get("guild_id")),
             channel_id=hikari.Snowflake(record.get("channel_id")),
             message_id=hikari.Snowflake(record.get("msg_id")),
-            emoji=hikari.Emoji.parse(record.get("emoji")),
+            emoji=parse_emoji(record.get("emoji")),
             label=record.get("label"),
             style=hikari.ButtonStyle[record.get("style")],
             mode=RoleButtonMode(record.get("mode")),
@@ -138,7 +242,7 @@ class RoleButton(DatabaseModel):
                 guild_id=hikari.Snowflake(record.get("guild_id")),
                 channel_id=hikari.Snowflake(record.get("channel_id")),
                 message_id=hikari.Snowflake(record.get("msg_id")),
-                emoji=hikari.Emoji.parse(record.get("emoji")),
+                emoji=parse_emoji(record.get("emoji")),
                 label=record.get("label"),
                 style=hikari.ButtonStyle[record.get("style")],
                 mode=RoleButtonMode(record.get("mode")),
@@ -195,27 +299,14 @@ class RoleButton(DatabaseModel):
             Failed to edit the provided message to add the rolebutton.
         """
 
-        record = await cls._db.fetchrow("""SELECT entry_id FROM button_roles ORDER BY entry_id DESC""")
-        id = record.get("entry_id") + 1 if record else 1
-        role_id = hikari.Snowflake(role)
-
-        button = miru.Button(
-            custom_id=f"RB:{id}:{role_id}",
-            emoji=emoji,
-            label=label,
-            style=style,
-        )
+        # Discord allows at most 25 components per message, bail before touching the database
+        if sum(1 for _ in _iter_custom_ids(message)) >= 25:
+            raise ValueError("Message has too many components attached to it.")
 
-        view = miru.View.from_message(message)
-        view.add_item(button)
-        message = await message.edit(components=view.build())
+        role_id = hikari.Snowflake(role)
 
-        await cls._db.execute(
-            """
-            INSERT INTO button_roles (entry_id, guild_id, channel_id, msg_id, emoji, label, style, mode, role_id)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            """,
-            id,
+        id: int = await cls._db.fetchval(
+            _SQL_INSERT_BUTTON_ROLE,
             hikari.Snowflake(guild),
             message.channel_id,
             message.id,
@@ -223,9 +314,25 @@ class RoleButton(DatabaseModel):
             label,
             style.name,
             mode.value,
-            hikari.Snowflake(role),
+            role_id,
+        )
+
+        button = miru.Button(
+            custom_id=pack_custom_id(id, role_id),
+            emoji=emoji,
+            label=label,
+            style=style,
         )
 
+        try:
+            view = miru.View.from_message(message)
+            view.add_item(button)
+            message = await message.edit(components=view.build())
+        except Exception:
+            # Do not leave a rolebutton behind that is not attached to any message
+            await cls._db.execute(_SQL_DELETE_BUTTON_ROLE, hikari.Snowflake(guild), id)
+            raise
+
         rolebutton = cls(
             id=id,
             guild_id=hikari.Snowflake(guild),
@@ -257,8 +364,12 @@ class RoleButton(DatabaseModel):
 
         message = await self._app.rest.fetch_message(self.channel_id, self.message_id)
 
+        custom_ids = self._custom_ids
+        if not any(custom_id in custom_ids for custom_id in _iter_custom_ids(message)):
+            raise ValueError("Rolebutton not found on message.")
+
         view = miru.View.from_message(message)
-        buttons = [item for item in view.children if item.custom_id == self.custom_id and isinstance(item, miru.Button)]
+        buttons = [item for item in view.children if item.custom_id in custom_ids and isinstance(item, miru.Button)]
 
         if not buttons:
             raise ValueError("Rolebutton not found on message.")
@@ -268,7 +379,7 @@ class RoleButton(DatabaseModel):
         button.emoji = self.emoji
         button.label = self.label
         button.style = self.style
-        button.custom_id = f"RB:{self.id}:{self.role_id}"
+        button.custom_id = pack_custom_id(self.id, self.role_id)  # Also migrates legacy custom_ids
         self._custom_id = button.custom_id
 
         message = await message.edit(components=view.build())
@@ -302,28 +413,97 @@ class RoleButton(DatabaseModel):
         Raises
         ------
         hikari.ForbiddenError
-            Failed to edit or fetch the message the button belongs to.
+            Failed to edit or fetch the message the button belongs to. The rolebutton is left intact.
         """
 
         try:
             message = await self._app.rest.fetch_message(self.channel_id, self.message_id)
         except hikari.NotFoundError:
             pass
-        else:  # Remove button if message still exists
-            view = miru.View.from_message(message)
-
-            for item in view.children:
-                if item.custom_id == f"RB:{self.id}:{self.role_id}":
+        else:  # Remove button if message still exists and the button is actually on it
+            custom_ids = self._custom_ids
+            if any(custom_id in custom_ids for custom_id in _iter_custom_ids(message)):
+                view = miru.View.from_message(message)
+                for item in [item for item in view.children if item.custom_id in custom_ids]:
                     view.remove_item(item)
-            message = await message.edit(components=view.build())
+                message = await message.edit(components=view.build())
 
-        await self._db.execute(
-            """DELETE FROM button_roles WHERE guild_id = $1 AND entry_id = $2""",
-            self.guild_id,
-            self.id,
-        )
+        await self._db.execute(_SQL_DELETE_BUTTON_ROLE, self.guild_id, self.id)
         self._app.dispatch(RoleButtonDeleteEvent(self._app, self.guild_id, self, moderator))
 
+    @classmethod
+    async def bulk_delete(
+        cls,
+        guild: hikari.SnowflakeishOr[hikari.PartialGuild],
+        buttons: t.Sequence[RoleButton],
+        moderator: t.Optional[hikari.PartialUser] = None,
+    ) -> t.List[RoleButton]:
+        """Delete multiple rolebuttons of a guild, editing every affected message only once
+        and removing all of their rows in a single query.
+
+        Parameters
+        ----------
+        guild : SnowflakeishOr[hikari.PartialGuild]
+            The guild the rolebuttons belong to.
+        buttons : Sequence[RoleButton]
+            The rolebuttons to delete.
+        moderator : Optional[hikari.PartialUser]
+            The user to log the rolebutton deletions under.
+
+        Returns
+        -------
+        List[RoleButton]
+            The rolebuttons that were deleted. Rolebuttons on messages that
+            could not be fetched or edited are left intact.
+
+        Raises
+        ------
+        ValueError
+            One of the rolebuttons does not belong to the specified guild.
+        """
+        guild_id = hikari.Snowflake(guild)
+
+        # Mapping of (channel_id, message_id): rolebuttons on that message
+        by_message: t.Dict[t.Tuple[hikari.Snowflake, hikari.Snowflake], t.List[RoleButton]] = {}
+        for button in buttons:
+            if button.guild_id != guild_id:
+                raise ValueError(f"Rolebutton #{button.id} does not belong to guild {guild_id}.")
+            by_message.setdefault((button.channel_id, button.message_id), []).append(button)
+
+        deleted: t.List[RoleButton] = []
+
+        for (channel_id, message_id), message_buttons in by_message.items():
+            try:
+                message = await cls._app.rest.fetch_message(channel_id, message_id)
+            except hikari.NotFoundError:
+                deleted.extend(message_buttons)
+                continue
+            except hikari.HTTPError:
+                continue
+
+            custom_ids = {custom_id for button in message_buttons for custom_id in button._custom_ids}
+            if any(custom_id in custom_ids for custom_id in _iter_custom_ids(message)):
+                view = miru.View.from_message(message)
+                for item in [item for item in view.children if item.custom_id in custom_ids]:
+                    view.remove_item(item)
+
+                try:
+                    await message.edit(components=view.build())
+                except hikari.HTTPError:
+                    continue
+
+            deleted.extend(message_buttons)
+
+        if not deleted:
+            return deleted
+
+        await cls._db.execute(_SQL_DELETE_BUTTON_ROLES, guild_id, [button.id for button in deleted])
+
+        for button in deleted:
+            cls._app.dispatch(RoleButtonDeleteEvent(cls._app, guild_id, button, moderator))
+
+        return deleted
+
 
 # Copyright (C) 2022-present HyperGH
 
@@ -124,6 +124,21 @@ class DatabaseCache:
         for record in records:
             self._cache[table].append(dict(record))
 
+    async def invalidate(self, table: str, **kwargs) -> None:
+        """
+        Discards a specific part of the cache without reloading it, the next get() will lazily fetch it again.
+        Prefer this over refresh() when the new values are not needed right away.
+        """
+        if not self.is_ready:
+            return
+
+        if self._cache.get(table) is None:
+            raise ValueError("Invalid table specified.")
+
+        self._cache[table] = [
+            row for row in self._cache[table] if not all(row[kwarg] == value for kwarg, value in kwargs.items())
+        ]
+
     async def wipe(self, guild: hikari.SnowflakeishOr[hikari.PartialGuild]) -> None:
         """
         Discards the entire cache for a guild.
@@ -25,6 +25,10 @@ LINK_REGEX = re.compile(
 )
 INVITE_REGEX = re.compile(r"(?:https?://)?discord(?:app)?\.(?:com/invite|gg)/[a-zA-Z0-9]+/?")
 
+# Bound search methods, for hot paths that need to find a link or invite anywhere in a string
+url_search = LINK_REGEX.search
+invite_search = INVITE_REGEX.search
+
 BADGE_EMOJI_MAPPING = {
     hikari.UserFlag.BUG_HUNTER_LEVEL_1: const.EMOJI_BUGHUNTER,
     hikari.UserFlag.BUG_HUNTER_LEVEL_2: const.EMOJI_BUGHUNTER_GOLD,
@@ -323,7 +327,7 @@ async def parse_message_link(ctx: SnedSlashContext, message_link: str) -> Option
         return None
 
     channel = ctx.app.cache.get_guild_channel(channel_id)
-    me = ctx.app.cache.get_member(ctx.guild_id, ctx.app.user_id)
+    me = ctx.me
     assert me is not None and isinstance(channel, hikari.TextableGuildChannel)
 
     if channel:  # Make reasonable attempt at checking perms
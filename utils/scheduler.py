@@ -448,6 +448,59 @@ class Scheduler:
 
             return timer
 
+    async def cancel_timers_bulk(
+        self,
+        guild: hikari.SnowflakeishOr[hikari.PartialGuild],
+        user: hikari.SnowflakeishOr[hikari.PartialUser],
+        event: TimerEvent,
+    ) -> t.List[Timer]:
+        """Prematurely cancel all timers of the given event type belonging to a user in a single query.
+        Returns the cancelled timers.
+
+        Parameters
+        ----------
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild the timers belong to.
+        user : hikari.SnowflakeishOr[hikari.PartialUser]
+            The user the timers belong to.
+        event : TimerEvent
+            The event type of the timers to be cancelled.
+
+        Returns
+        -------
+        List[Timer]
+            The cancelled timer objects.
+        """
+        if not self._is_started:
+            raise hikari.ComponentStateConflictError("The scheduler is not running.")
+
+        records = await self.bot.db.fetch(
+            """DELETE FROM timers WHERE guild_id = $1 AND user_id = $2 AND event = $3 RETURNING *""",
+            hikari.Snowflake(guild),
+            hikari.Snowflake(user),
+            event.value,
+        )
+        timers = [
+            Timer(
+                record.get("id"),
+                hikari.Snowflake(record.get("guild_id")),
+                hikari.Snowflake(record.get("user_id")),
+                hikari.Snowflake(record.get("channel_id")) if record.get("channel_id") else None,
+                TimerEvent(record.get("event")),
+                record.get("expires"),
+                record.get("notes"),
+            )
+            for record in records
+        ]
+
+        # Only reshuffle once, even if multiple timers were cancelled
+        if self._current_timer and any(timer.id == self._current_timer.id for timer in timers):
+            if self._current_task:
+                self._current_task.cancel()
+            self._current_task = asyncio.create_task(self._dispatch_timers())
+
+        return timers
+
     async def _wait_for_active_timers(self) -> None:
         """
         Check every hour to see if new timers meet criteria in the database.